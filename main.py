@@ -1,45 +1,201 @@
 import asyncio
-import json
+import functools
+import heapq
 import os
+import time
 import re
+import sys
+from collections import defaultdict
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from typing import DefaultDict, Dict, List, Optional, Tuple
 import calendar
-import dateparser
 import logging
+import orjson
 from pkg.plugin.context import register, handler, llm_func, BasePlugin, APIHost, EventContext
 from pkg.plugin.events import *
 import pkg.platform.types as platform_types
 
 
+# 时间解析用的映射表和预编译正则
+# 统一星期表达
+_WEEKDAY_ALIASES = {
+    '周一': '星期一', '周二': '星期二', '周三': '星期三',
+    '周四': '星期四', '周五': '星期五', '周六': '星期六',
+    '周日': '星期日', '周天': '星期日', '礼拜': '星期',
+    '这周': '本周', '这个周': '本周', '这星期': '本周'
+}
+
+# 统一时间表达
+_TIME_ALIASES = {
+    '早上': '上午', '早晨': '上午', '中午': '12点',
+    '下午': '下午', '傍晚': '下午6点', '晚上': '晚上',
+    '夜里': '晚上', '凌晨': '凌晨'
+}
+
+# 中文数字转阿拉伯数字
+_CHINESE_NUMS = {
+    '零': '0', '一': '1', '二': '2', '三': '3', '四': '4',
+    '五': '5', '六': '6', '七': '7', '八': '8', '九': '9',
+    '十': '10', '十一': '11', '十二': '12'
+}
+
+_WEEKDAYS = {
+    '星期一': 0, '星期二': 1, '星期三': 2, '星期四': 3,
+    '星期五': 4, '星期六': 5, '星期日': 6, '星期天': 6
+}
+
+# 相对日期映射
+_RELATIVE_DAYS = {
+    '今天': 0, '明天': 1, '后天': 2, '大后天': 3,
+    '明日': 1, '后日': 2
+}
+
+# 带日期的标准时间格式，只有时间的格式由 _CLOCK_RE 解析
+_DATETIME_FORMATS = (
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%d %H:%M",
+    "%Y/%m/%d %H:%M",
+    "%m-%d %H:%M",
+    "%m月%d日 %H点%M分",
+    "%m月%d日 %H点"
+)
+
+_DATEPARSER_SETTINGS = {
+    'TIMEZONE': 'Asia/Shanghai',
+    'PREFER_DATES_FROM': 'future',
+    'PREFER_DAY_OF_MONTH': 'first',
+    'RETURN_AS_TIMEZONE_AWARE': False
+}
+
+
+def _alternation(words) -> re.Pattern:
+    """将词表编译为一个正则，长词优先匹配"""
+    return re.compile('|'.join(map(re.escape, sorted(words, key=len, reverse=True))))
+
+
+_WEEKDAY_RE = _alternation(_WEEKDAYS)
+_RELATIVE_DAY_RE = _alternation(_RELATIVE_DAYS)
+_NEXT_WEEK_RE = re.compile(r'下周(.*?)(\d{1,2})[点时]')
+_THIS_WEEK_RE = re.compile(r'(本周|这周)(.*?)(\d{1,2})[点时]')
+_HOUR_RE = re.compile(r'(\d{1,2})[点时]')
+_HOUR_MINUTE_RE = re.compile(r'(\d{1,2})[点时](?:(\d{1,2})分?)?')
+_MINUTE_RE = re.compile(r'(\d{1,2})[点时](\d{1,2})分?')
+_NUMBER_RE = re.compile(r'\d+')
+_CLOCK_RE = re.compile(r'(\d{1,2})(?::(\d{1,2})|点(?:(\d{1,2})分)?)')
+_RELATIVE_OFFSET_RE = re.compile(r'\d+\s*个?\s*半?\s*(?:分钟|小时|天|周|个?月)\s*[以之]?后')
+_STANDARD_FORMAT_RE = re.compile(r'\d{1,4}[-/:月]\d{1,2}')
+
+# 聊天命令，预先驻留以加快哈希查找
+_LIST_COMMANDS = frozenset(map(sys.intern, ("查看提醒", "提醒列表", "我的提醒")))
+_HELP_COMMANDS = frozenset(map(sys.intern, ("提醒帮助", "定时提醒帮助")))
+_DELETE_PREFIX = sys.intern("删除提醒")
+_PAUSE_PREFIX = sys.intern("暂停提醒")
+_RESUME_PREFIX = sys.intern("恢复提醒")
+
+
+@dataclass(slots=True)
+class Reminder:
+    """提醒记录"""
+    id: str
+    sender_id: str
+    target_id: str
+    target_type: str
+    content: str
+    target_time: str  # ISO格式，用于持久化和展示
+    repeat_type: str = '不重复'
+    active: bool = True
+    created_at: str = ''
+    anchor_day: int = 0  # 每月重复的目标日期，0 表示取当前目标时间的日期
+
+
 # 注册插件
 @register(name="QReminderPlugin", description="智能定时提醒插件，支持设置单次和重复提醒，基于自然语言理解", version="1.2.0", author="Wedjat98")
 class ReminderPlugin(BasePlugin):
 
+    _MAX_SCHEDULER_WAIT = 60  # 调度协程单次最长等待秒数
+
+    _WEEKDAY_NAMES = ('星期一', '星期二', '星期三', '星期四', '星期五', '星期六', '星期日')
+
+    _TIME_SUGGESTIONS = "\n".join((
+        "• 相对时间：30分钟后、2小时后、3天后",
+        "• 具体日期：明天下午3点、后天晚上8点",
+        "• 星期时间：本周六晚上9点、下周一上午10点",
+        "• 标准格式：2025-06-08 15:30"
+    ))
+
+    _HELP_TEXT = """📖 定时提醒插件使用说明：
+
+🤖 AI智能设置（推荐）：
+直接对我说话，例如：
+- "提醒我30分钟后开会"
+- "明天下午3点提醒我买菜"
+- "每天晚上8点提醒我吃药"
+
+📋 手动管理命令：
+- 查看提醒 - 查看所有提醒
+- 删除提醒 [序号] - 删除指定提醒
+- 暂停提醒 [序号] - 暂停指定提醒
+- 恢复提醒 [序号] - 恢复指定提醒
+
+⏰ 支持的时间格式：
+- 相对时间：30分钟后、2小时后、明天
+- 绝对时间：今晚8点、明天下午3点
+- 重复类型：每天、每周、每月
+
+💡 使用技巧：
+AI会自动理解你的自然语言，无需记忆复杂命令格式！"""
+
     def __init__(self, host: APIHost):
         self.host = host
-        self.reminders: Dict[str, Dict] = {}  # 存储提醒信息
+        self.reminders: Dict[str, Reminder] = {}  # 存储提醒信息
+        self._parsed: Dict[str, Tuple[datetime, float]] = {}  # 提醒ID -> (目标时间, 目标时间戳)
+        self._by_sender: DefaultDict[str, Dict[str, None]] = defaultdict(dict)  # 用户ID -> 按添加顺序排列的提醒ID
         self.data_file = "reminders.json"
-        self.running_tasks = {}  # 存储运行中的任务
+        self._sending_tasks = set()  # 正在发送的提醒任务，保持引用直到完成
+        self._heap: List[Tuple[float, str]] = []  # 待触发提醒的最小堆 (目标时间戳, 提醒ID)
+        self._pending: Dict[str, float] = {}  # 提醒ID -> 堆中有效条目的时间戳，用于惰性删除
+        self._wake = asyncio.Event()  # 堆顶变化时唤醒调度协程
+        self._scheduler_task = None  # 唯一的调度协程
+        self._dirty = asyncio.Event()  # 提醒数据有未保存的修改
+        self._flusher_task = None  # 合并写入的保存协程
         self.adapter_cache = None  # 缓存适配器
-        self.last_adapter_check = None  # 最后检查适配器的时间
+        self.last_adapter_check = None  # 最后检查适配器的时间（time.monotonic）
+        self._dateparser_parse = None  # 首次使用时导入的 dateparser.parse
+        # 每个实例独立的时间解析缓存，避免类级缓存持有实例引用
+        self._parse_time_cached = functools.lru_cache(maxsize=512)(self._parse_time_uncached)
+        
+        # 命令分发表
+        self._exact_commands = {
+            **dict.fromkeys(_LIST_COMMANDS, self._handle_list_reminders),
+            **dict.fromkeys(_HELP_COMMANDS, self._handle_help),
+        }
+        self._prefix_commands = (
+            (_DELETE_PREFIX, self._handle_delete_reminder),
+            (_PAUSE_PREFIX, self._handle_pause_reminder),
+            (_RESUME_PREFIX, self._handle_resume_reminder),
+        )
         
     async def initialize(self):
         """异步初始化，加载已保存的提醒"""
         # 加载已保存的提醒
         await self._load_reminders()
         
+        # 启动调度协程和保存协程
+        self._scheduler_task = asyncio.create_task(self._run_scheduler())
+        self._flusher_task = asyncio.create_task(self._run_flusher())
+        
         # 恢复所有活跃的提醒任务
         restored_count = 0
+        now_ts = time.time()
         for reminder_id, reminder_data in self.reminders.items():
-            if reminder_data.get('active', True):
+            if reminder_data.active:
                 # 检查提醒时间是否还未到
-                target_time = datetime.fromisoformat(reminder_data['target_time'])
-                if target_time > datetime.now():
-                    await self._schedule_reminder(reminder_id, reminder_data)
+                if self._parsed[reminder_id][1] > now_ts:
+                    await self._schedule_reminder(reminder_id, reminder_data, now_ts)
                     restored_count += 1
                 else:
-                    self.ap.logger.info(f"⏰ 跳过已过期的提醒: {reminder_data['content']}")
+                    self.ap.logger.info(f"⏰ 跳过已过期的提醒: {reminder_data.content}")
         
         self.ap.logger.info(f"🚀 提醒插件初始化完成，恢复了 {restored_count} 个活跃提醒任务")
 
@@ -48,14 +204,14 @@ class ReminderPlugin(BasePlugin):
         try:
             # 如果缓存存在且在5分钟内，直接返回
             if self.adapter_cache and self.last_adapter_check:
-                if (datetime.now() - self.last_adapter_check).seconds < 300:
+                if time.monotonic() - self.last_adapter_check < 300:
                     return self.adapter_cache
             
             # 重新获取适配器
             adapters = self.host.get_platform_adapters()
             if adapters and len(adapters) > 0:
                 self.adapter_cache = adapters[0]
-                self.last_adapter_check = datetime.now()
+                self.last_adapter_check = time.monotonic()
                 self.ap.logger.debug(f"✅ 成功获取适配器: {type(self.adapter_cache)}")
                 return self.adapter_cache
             else:
@@ -70,24 +226,74 @@ class ReminderPlugin(BasePlugin):
         """从文件加载提醒数据"""
         try:
             if os.path.exists(self.data_file):
-                with open(self.data_file, 'r', encoding='utf-8') as f:
-                    self.reminders = json.load(f)
-                    # 转换旧格式的时间字符串为datetime对象
-                    for reminder_data in self.reminders.values():
-                        if isinstance(reminder_data.get('target_time'), str):
-                            reminder_data['target_time'] = reminder_data['target_time']
+                with open(self.data_file, 'rb') as f:
+                    data = orjson.loads(f.read())
+                self.reminders = {rid: Reminder(**item) for rid, item in data.items()}
+                # 解析一次目标时间并缓存
+                for reminder_id, reminder_data in self.reminders.items():
+                    self._cache_target_time(reminder_id, reminder_data)
+                    self._by_sender[reminder_data.sender_id][reminder_id] = None
         except Exception as e:
             self.ap.logger.error(f"加载提醒数据失败: {e}")
             self.reminders = {}
-
-    async def _save_reminders(self):
-        """保存提醒数据到文件"""
+            self._parsed = {}
+            self._by_sender = defaultdict(dict)
+
+    def _cache_target_time(self, reminder_id: str, reminder_data: Reminder):
+        """缓存提醒的目标时间，避免重复解析ISO字符串"""
+        target_time = datetime.fromisoformat(reminder_data.target_time)
+        self._parsed[reminder_id] = (target_time, target_time.timestamp())
+
+    def _add_reminder(self, reminder_id: str, reminder_data: Reminder):
+        """添加提醒"""
+        self.reminders[reminder_id] = reminder_data
+        self._cache_target_time(reminder_id, reminder_data)
+        self._by_sender[reminder_data.sender_id][reminder_id] = None
+
+    def _update_target_time(self, reminder_id: str, target_time: datetime):
+        """更新提醒的目标时间"""
+        self.reminders[reminder_id].target_time = target_time.isoformat()
+        self._parsed[reminder_id] = (target_time, target_time.timestamp())
+
+    def _remove_reminder(self, reminder_id: str):
+        """删除提醒"""
+        reminder_data = self.reminders.pop(reminder_id)
+        self._parsed.pop(reminder_id, None)
+        
+        sender_id = reminder_data.sender_id
+        sender_reminders = self._by_sender.get(sender_id)
+        if sender_reminders is not None:
+            sender_reminders.pop(reminder_id, None)
+            if not sender_reminders:
+                del self._by_sender[sender_id]
+
+    def _get_user_reminders(self, sender_id: str) -> List[Tuple[str, Reminder]]:
+        """获取用户的所有提醒，按添加顺序排列，序号在查看、删除、暂停、恢复命令间保持一致"""
+        return [(rid, self.reminders[rid]) for rid in self._by_sender.get(sender_id, ())]
+
+    def _save_reminders(self):
+        """保存提醒数据到文件（先写临时文件再原子替换）"""
         try:
-            with open(self.data_file, 'w', encoding='utf-8') as f:
-                json.dump(self.reminders, f, ensure_ascii=False, indent=2, default=str)
+            data = orjson.dumps(self.reminders, option=orjson.OPT_INDENT_2, default=str)
+            tmp_file = f"{self.data_file}.tmp"
+            with open(tmp_file, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_file, self.data_file)
         except Exception as e:
             self.ap.logger.error(f"保存提醒数据失败: {e}")
 
+    def _mark_dirty(self):
+        """标记提醒数据已修改，由保存协程合并写入"""
+        self._dirty.set()
+
+    async def _run_flusher(self):
+        """保存协程：合并短时间内的多次修改，只写一次文件"""
+        while True:
+            await self._dirty.wait()
+            await asyncio.sleep(0.5)
+            self._dirty.clear()
+            self._save_reminders()
+
     @llm_func("set_reminder")
     async def set_reminder_llm(self, query, content: str, time_description: str, repeat_type: str = "不重复"):
         """AI函数调用接口：设置提醒
@@ -128,45 +334,39 @@ class ReminderPlugin(BasePlugin):
             # 解析时间
             target_time = await self._parse_time_natural(time_description)
             if not target_time:
-                suggestions = [
-                    "• 相对时间：30分钟后、2小时后、3天后",
-                    "• 具体日期：明天下午3点、后天晚上8点",  
-                    "• 星期时间：本周六晚上9点、下周一上午10点",
-                    "• 标准格式：2025-06-08 15:30"
-                ]
-                return f"⚠️ 无法理解时间 '{time_description}'\n\n支持的格式示例：\n" + "\n".join(suggestions)
+                return f"⚠️ 无法理解时间 '{time_description}'\n\n支持的格式示例：\n{self._TIME_SUGGESTIONS}"
 
             # 检查时间是否已过
-            if target_time <= datetime.now():
+            if target_time.timestamp() <= time.time():
                 return "⚠️ 设置的时间已经过去了，请重新设置！"
 
             # 生成提醒ID
-            reminder_id = f"{target_info['sender_id']}_{int(datetime.now().timestamp())}"
+            reminder_id = f"{target_info['sender_id']}_{int(time.time())}"
             
             # 创建提醒数据
-            reminder_data = {
-                'id': reminder_id,
-                'sender_id': target_info['sender_id'],
-                'target_id': target_info['target_id'],
-                'target_type': target_info['target_type'],
-                'content': content,
-                'target_time': target_time.isoformat(),
-                'repeat_type': repeat_type,
-                'active': True,
-                'created_at': datetime.now().isoformat()
-            }
+            reminder_data = Reminder(
+                id=reminder_id,
+                sender_id=target_info['sender_id'],
+                target_id=target_info['target_id'],
+                target_type=target_info['target_type'],
+                content=content,
+                target_time=target_time.isoformat(),
+                repeat_type=repeat_type,
+                active=True,
+                created_at=datetime.now().isoformat(),
+                anchor_day=target_time.day
+            )
 
             # 保存提醒
-            self.reminders[reminder_id] = reminder_data
-            await self._save_reminders()
+            self._add_reminder(reminder_id, reminder_data)
+            self._mark_dirty()
 
             # 安排提醒任务
             await self._schedule_reminder(reminder_id, reminder_data)
 
             # 返回确认信息，包含星期信息
             time_str_formatted = target_time.strftime("%Y年%m月%d日 %H:%M")
-            weekday_names = ['星期一', '星期二', '星期三', '星期四', '星期五', '星期六', '星期日']
-            weekday = weekday_names[target_time.weekday()]
+            weekday = self._WEEKDAY_NAMES[target_time.weekday()]
             repeat_info = f"\n🔄 重复：{repeat_type}" if repeat_type != "不重复" else ""
             
             self.ap.logger.info(f"🎯 用户 {target_info['sender_id']} 设置提醒成功: {content} 在 {time_str_formatted}")
@@ -192,179 +392,142 @@ class ReminderPlugin(BasePlugin):
         msg = ctx.event.text_message.strip()
         sender_id = str(ctx.event.sender_id)
         
-        # 查看提醒列表
-        if msg in ["查看提醒", "提醒列表", "我的提醒"]:
-            await self._handle_list_reminders(ctx, sender_id)
-        
-        # 删除提醒
-        elif msg.startswith("删除提醒"):
-            await self._handle_delete_reminder(ctx, msg, sender_id)
+        # 完整命令直接查表
+        command_handler = self._exact_commands.get(msg)
+        if command_handler:
+            await command_handler(ctx, sender_id)
+            return
         
-        # 暂停/恢复提醒
-        elif msg.startswith("暂停提醒"):
-            await self._handle_pause_reminder(ctx, msg, sender_id)
-        elif msg.startswith("恢复提醒"):
-            await self._handle_resume_reminder(ctx, msg, sender_id)
-        
-        # 帮助信息
-        elif msg in ["提醒帮助", "定时提醒帮助"]:
-            await self._handle_help(ctx)
+        # 带参数的命令按前缀匹配
+        for prefix, command_handler in self._prefix_commands:
+            if msg.startswith(prefix):
+                await command_handler(ctx, msg[len(prefix):].strip(), sender_id)
+                return
 
     async def _parse_time_natural(self, time_str: str) -> datetime:
-        """增强的自然语言时间解析"""
+        """增强的自然语言时间解析，同一分钟内相同的描述直接复用缓存结果"""
         try:
-            self.ap.logger.debug(f"开始解析时间: '{time_str}'")
-            
-            # 预处理时间字符串
-            processed_time = await self._preprocess_time_string(time_str)
-            self.ap.logger.debug(f"预处理后: '{processed_time}'")
-            
-            # 尝试多种解析策略
-            parsers = [
-                self._parse_weekday_time,      # 星期相关
-                self._parse_relative_days,      # 相对日期
-                self._parse_specific_time,      # 具体时间
-                self._parse_with_dateparser,    # dateparser库
-                self._parse_time_manual         # 手动解析
-            ]
-            
-            for parser in parsers:
-                result = await parser(processed_time)
-                if result and result > datetime.now():
-                    self.ap.logger.debug(f"解析成功 ({parser.__name__}): {result}")
-                    return result
-            
-            # 如果所有方法都失败，尝试原始字符串
-            for parser in parsers:
-                result = await parser(time_str)
-                if result and result > datetime.now():
-                    self.ap.logger.debug(f"原始字符串解析成功 ({parser.__name__}): {result}")
-                    return result
-                    
-            return None
-            
+            return self._parse_time_cached(time_str, int(time.time() // 60))
         except Exception as e:
             self.ap.logger.error(f"解析时间失败: {e}")
             return None
 
-    async def _preprocess_time_string(self, time_str: str) -> str:
+    def _parse_time_uncached(self, time_str: str, now_bucket: int) -> Optional[datetime]:
+        """时间解析，经 _parse_time_cached 按 (时间描述, 当前分钟) 缓存，now_bucket 仅用作缓存键"""
+        self.ap.logger.debug(f"开始解析时间: '{time_str}'")
+        
+        # 预处理时间字符串
+        processed_time = self._preprocess_time_string(time_str)
+        self.ap.logger.debug(f"预处理后: '{processed_time}'")
+        
+        # 按特征选出对应的解析策略，dateparser 作为兜底
+        parser = self._classify_time_string(processed_time)
+        parsers = (parser, self._parse_with_dateparser) if parser else (self._parse_with_dateparser,)
+        
+        past_result = None
+        for parser in parsers:
+            result = parser(processed_time)
+            if result and result > datetime.now():
+                self.ap.logger.debug(f"解析成功 ({parser.__name__}): {result}")
+                return result
+            past_result = past_result or result
+        
+        # 能解析但时间已过（如傍晚说"今天下午5点"）时原样返回，由调用方提示时间已过
+        if past_result:
+            self.ap.logger.debug(f"解析结果已过期: {past_result}")
+        return past_result
+
+    def _classify_time_string(self, time_str: str):
+        """根据时间描述的特征选择解析策略，无法归类时返回 None"""
+        if _RELATIVE_OFFSET_RE.search(time_str):
+            return self._parse_time_manual      # 相对时间：30分钟后
+        if _WEEKDAY_RE.search(time_str):
+            return self._parse_weekday_time     # 星期相关
+        if _RELATIVE_DAY_RE.search(time_str):
+            return self._parse_relative_days    # 相对日期
+        if _HOUR_RE.search(time_str):
+            return self._parse_specific_time    # 具体时间
+        if _STANDARD_FORMAT_RE.search(time_str):
+            return self._parse_time_manual      # 标准格式
+        return None
+
+    def _preprocess_time_string(self, time_str: str) -> str:
         """预处理时间字符串，统一格式"""
         # 移除多余的空格
         time_str = ' '.join(time_str.split())
         
         # 统一星期表达
-        weekday_map = {
-            '周一': '星期一', '周二': '星期二', '周三': '星期三',
-            '周四': '星期四', '周五': '星期五', '周六': '星期六',
-            '周日': '星期日', '周天': '星期日', '礼拜': '星期',
-            '这周': '本周', '这个周': '本周', '这星期': '本周'
-        }
-        
-        for old, new in weekday_map.items():
+        for old, new in _WEEKDAY_ALIASES.items():
             time_str = time_str.replace(old, new)
         
         # 统一时间表达
-        time_map = {
-            '早上': '上午', '早晨': '上午', '中午': '12点',
-            '下午': '下午', '傍晚': '下午6点', '晚上': '晚上',
-            '夜里': '晚上', '凌晨': '凌晨'
-        }
-        
-        for old, new in time_map.items():
+        for old, new in _TIME_ALIASES.items():
             time_str = time_str.replace(old, new)
         
         # 转换中文数字为阿拉伯数字
-        chinese_nums = {
-            '零': '0', '一': '1', '二': '2', '三': '3', '四': '4',
-            '五': '5', '六': '6', '七': '7', '八': '8', '九': '9',
-            '十': '10', '十一': '11', '十二': '12'
-        }
-        
-        for cn, num in chinese_nums.items():
+        for cn, num in _CHINESE_NUMS.items():
             time_str = time_str.replace(cn + '点', num + '点')
         
         return time_str
 
-    async def _parse_weekday_time(self, time_str: str) -> datetime:
+    def _parse_weekday_time(self, time_str: str) -> datetime:
         """解析星期相关的时间表达"""
-        weekdays = {
-            '星期一': 0, '星期二': 1, '星期三': 2, '星期四': 3,
-            '星期五': 4, '星期六': 5, '星期日': 6, '星期天': 6
-        }
+        weekday_match = _WEEKDAY_RE.search(time_str)
+        if not weekday_match:
+            return None
+        wd_num = _WEEKDAYS[weekday_match.group()]
         
         # 解析 "下周X" 模式
-        next_week_pattern = r'下周(.*?)(\d{1,2})[点时]'
-        match = re.search(next_week_pattern, time_str)
+        match = _NEXT_WEEK_RE.search(time_str)
         if match:
-            weekday_str = match.group(1).strip()
             hour = int(match.group(2))
-            
-            for wd_name, wd_num in weekdays.items():
-                if wd_name in weekday_str or wd_name in time_str:
-                    target_date = self._get_next_weekday(wd_num, weeks_ahead=1)
-                    return self._combine_date_time(target_date, hour, time_str)
+            target_date = self._get_next_weekday(wd_num, weeks_ahead=1)
+            return self._combine_date_time(target_date, hour, time_str)
         
         # 解析 "本周X" 或 "这周X" 模式
-        this_week_pattern = r'(本周|这周)(.*?)(\d{1,2})[点时]'
-        match = re.search(this_week_pattern, time_str)
+        match = _THIS_WEEK_RE.search(time_str)
         if match:
-            weekday_str = match.group(2).strip()
             hour = int(match.group(3))
-            
-            for wd_name, wd_num in weekdays.items():
-                if wd_name in weekday_str or wd_name in time_str:
-                    target_date = self._get_next_weekday(wd_num, weeks_ahead=0)
-                    return self._combine_date_time(target_date, hour, time_str)
+            target_date = self._get_next_weekday(wd_num, weeks_ahead=0)
+            return self._combine_date_time(target_date, hour, time_str)
         
         # 解析普通 "星期X" 模式（默认为下一个该星期）
-        for wd_name, wd_num in weekdays.items():
-            if wd_name in time_str:
-                # 提取时间
-                time_match = re.search(r'(\d{1,2})[点时]', time_str)
-                if time_match:
-                    hour = int(time_match.group(1))
-                    target_date = self._get_next_weekday(wd_num)
-                    return self._combine_date_time(target_date, hour, time_str)
+        time_match = _HOUR_RE.search(time_str)
+        if time_match:
+            hour = int(time_match.group(1))
+            target_date = self._get_next_weekday(wd_num)
+            return self._combine_date_time(target_date, hour, time_str)
         
         return None
 
-    async def _parse_relative_days(self, time_str: str) -> datetime:
+    def _parse_relative_days(self, time_str: str) -> datetime:
         """解析相对日期表达"""
-        now = datetime.now()
-        
-        # 相对日期映射
-        relative_days = {
-            '今天': 0, '明天': 1, '后天': 2, '大后天': 3,
-            '明日': 1, '后日': 2
-        }
-        
-        for day_name, days_offset in relative_days.items():
-            if day_name in time_str:
-                target_date = now + timedelta(days=days_offset)
-                
-                # 提取时间
-                time_match = re.search(r'(\d{1,2})[点时]', time_str)
-                if time_match:
-                    hour = int(time_match.group(1))
-                    return self._combine_date_time(target_date, hour, time_str)
-                
-                # 如果没有具体时间，根据上下文推测
-                if '上午' in time_str:
-                    return target_date.replace(hour=9, minute=0, second=0, microsecond=0)
-                elif '下午' in time_str:
-                    return target_date.replace(hour=15, minute=0, second=0, microsecond=0)
-                elif '晚上' in time_str:
-                    return target_date.replace(hour=20, minute=0, second=0, microsecond=0)
+        day_match = _RELATIVE_DAY_RE.search(time_str)
+        if day_match:
+            target_date = datetime.now() + timedelta(days=_RELATIVE_DAYS[day_match.group()])
+            
+            # 提取时间
+            time_match = _HOUR_RE.search(time_str)
+            if time_match:
+                hour = int(time_match.group(1))
+                return self._combine_date_time(target_date, hour, time_str)
+            
+            # 如果没有具体时间，根据上下文推测
+            if '上午' in time_str:
+                return target_date.replace(hour=9, minute=0, second=0, microsecond=0)
+            elif '下午' in time_str:
+                return target_date.replace(hour=15, minute=0, second=0, microsecond=0)
+            elif '晚上' in time_str:
+                return target_date.replace(hour=20, minute=0, second=0, microsecond=0)
         
         return None
 
-    async def _parse_specific_time(self, time_str: str) -> datetime:
+    def _parse_specific_time(self, time_str: str) -> datetime:
         """解析具体时间表达"""
         now = datetime.now()
         
         # 解析 "X点X分" 格式
-        time_pattern = r'(\d{1,2})[点时](?:(\d{1,2})分?)?'
-        match = re.search(time_pattern, time_str)
+        match = _HOUR_MINUTE_RE.search(time_str)
         
         if match:
             hour = int(match.group(1))
@@ -387,20 +550,18 @@ class ReminderPlugin(BasePlugin):
         
         return None
 
-    async def _parse_with_dateparser(self, time_str: str) -> datetime:
+    def _parse_with_dateparser(self, time_str: str) -> datetime:
         """使用dateparser库解析"""
         try:
-            settings = {
-                'TIMEZONE': 'Asia/Shanghai',
-                'PREFER_DATES_FROM': 'future',
-                'PREFER_DAY_OF_MONTH': 'first',
-                'RETURN_AS_TIMEZONE_AWARE': False
-            }
+            # dateparser 导入开销较大，仅在首次需要时导入
+            if self._dateparser_parse is None:
+                import dateparser
+                self._dateparser_parse = dateparser.parse
             
-            parsed_time = dateparser.parse(
+            parsed_time = self._dateparser_parse(
                 time_str, 
                 languages=['zh', 'en'],
-                settings=settings
+                settings=_DATEPARSER_SETTINGS
             )
             
             if parsed_time:
@@ -410,14 +571,14 @@ class ReminderPlugin(BasePlugin):
         
         return None
 
-    async def _parse_time_manual(self, time_str: str) -> datetime:
+    def _parse_time_manual(self, time_str: str) -> datetime:
         """手动解析时间字符串（增强版）"""
         now = datetime.now()
         
         # 相对时间解析
         if "后" in time_str:
             # 提取数字
-            numbers = re.findall(r'\d+', time_str)
+            numbers = _NUMBER_RE.findall(time_str)
             if numbers:
                 value = int(numbers[0])
                 
@@ -432,37 +593,31 @@ class ReminderPlugin(BasePlugin):
                 elif "月" in time_str:
                     return now + timedelta(days=value * 30)
         
-        # 尝试解析标准格式
-        formats = [
-            "%Y-%m-%d %H:%M:%S",
-            "%Y-%m-%d %H:%M",
-            "%Y/%m/%d %H:%M",
-            "%m-%d %H:%M",
-            "%m月%d日 %H点%M分",
-            "%m月%d日 %H点",
-            "%H:%M",
-            "%H点%M分",
-            "%H点"
-        ]
-        
-        for fmt in formats:
+        # 只有时间（15:30、15点30分、15点），默认今天
+        clock_match = _CLOCK_RE.fullmatch(time_str)
+        if clock_match:
+            hour = int(clock_match.group(1))
+            minute = int(clock_match.group(2) or clock_match.group(3) or 0)
+            if hour > 23 or minute > 59:
+                return None
+            target = datetime(now.year, now.month, now.day, hour, minute)
+            if target <= now:
+                target += timedelta(days=1)
+            return target
+        
+        # 尝试解析带日期的标准格式
+        for fmt in _DATETIME_FORMATS:
             try:
-                if "%Y" not in fmt and "%m" not in fmt:
-                    # 只有时间，默认今天
-                    parsed = datetime.strptime(time_str, fmt)
-                    target = now.replace(
-                        hour=parsed.hour,
-                        minute=parsed.minute if "%M" in fmt else 0,
-                        second=0,
-                        microsecond=0
-                    )
-                    if target <= now:
-                        target += timedelta(days=1)
-                    return target
-                else:
-                    return datetime.strptime(time_str, fmt)
+                parsed = datetime.strptime(time_str, fmt)
             except ValueError:
                 continue
+            if "%Y" in fmt:
+                return parsed
+            # 没有年份时取今年，已过则取明年
+            target = parsed.replace(year=now.year)
+            if target <= now:
+                target = target.replace(year=now.year + 1)
+            return target
         
         return None
 
@@ -478,11 +633,11 @@ class ReminderPlugin(BasePlugin):
         
         return today + timedelta(days=days_ahead)
 
-    def _combine_date_time(self, date, hour: int, time_str: str) -> datetime:
+    def _combine_date_time(self, date, hour: int, time_str: str) -> Optional[datetime]:
         """组合日期和时间"""
         # 处理分钟
         minute = 0
-        minute_match = re.search(r'(\d{1,2})[点时](\d{1,2})分?', time_str)
+        minute_match = _MINUTE_RE.search(time_str)
         if minute_match:
             minute = int(minute_match.group(2))
         
@@ -492,42 +647,88 @@ class ReminderPlugin(BasePlugin):
         elif '晚上' in time_str and hour < 12:
             hour += 12
         
-        # 如果是date对象，转换为datetime
-        if isinstance(date, datetime):
-            result = date.replace(hour=hour, minute=minute, second=0, microsecond=0)
-        else:
-            result = datetime.combine(date, datetime.min.time())
-            result = result.replace(hour=hour, minute=minute, second=0, microsecond=0)
+        # 超出范围（如"晚上12点"）视为无法解析
+        if hour > 23 or minute > 59:
+            return None
         
-        return result
+        # date 和 datetime 对象都直接构造
+        return datetime(date.year, date.month, date.day, hour, minute)
 
-    async def _schedule_reminder(self, reminder_id: str, reminder_data: Dict):
-        """安排提醒任务"""
+    async def _schedule_reminder(self, reminder_id: str, reminder_data: Reminder, now_ts: Optional[float] = None):
+        """安排提醒任务，将其加入调度堆，批量安排时可传入统一的当前时间戳"""
         try:
-            target_time = datetime.fromisoformat(reminder_data['target_time'])
-            delay = (target_time - datetime.now()).total_seconds()
+            target_ts = self._parsed[reminder_id][1]
+            delay = target_ts - (now_ts if now_ts is not None else time.time())
             
             if delay > 0:
-                # 创建异步任务
-                task = asyncio.create_task(self._reminder_task(reminder_id, delay))
-                self.running_tasks[reminder_id] = task
+                # 同一时间戳已在堆中时无需重复入堆
+                if self._pending.get(reminder_id) == target_ts:
+                    return
+                self._pending[reminder_id] = target_ts
+                heapq.heappush(self._heap, (target_ts, reminder_id))
+                
+                # 新提醒成为堆顶时唤醒调度协程重新计算等待时间
+                if self._heap[0][1] == reminder_id:
+                    self._wake.set()
                 self.ap.logger.debug(f"安排提醒任务 {reminder_id}，延迟 {delay} 秒")
                 
         except Exception as e:
             self.ap.logger.error(f"安排提醒任务失败: {e}")
 
-    async def _reminder_task(self, reminder_id: str, delay: float):
+    def _unschedule_reminder(self, reminder_id: str):
+        """取消提醒调度，堆中的旧条目在弹出时惰性丢弃"""
+        self._pending.pop(reminder_id, None)
+
+    async def _run_scheduler(self):
+        """调度协程：按堆顶时间等待，到期后派发提醒"""
+        while True:
+            try:
+                self._wake.clear()
+                
+                if not self._heap:
+                    await self._wake.wait()
+                    continue
+                
+                target_ts, reminder_id = self._heap[0]
+                timeout = target_ts - time.time()
+                if timeout > 0:
+                    # 分段等待，系统时间被调整（NTP校时等）后能及时按新的墙上时间重新计算
+                    try:
+                        await asyncio.wait_for(self._wake.wait(), min(timeout, self._MAX_SCHEDULER_WAIT))
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+                
+                heapq.heappop(self._heap)
+                
+                # 已取消或已重新安排的条目直接丢弃
+                if self._pending.get(reminder_id) != target_ts:
+                    continue
+                del self._pending[reminder_id]
+                
+                task = asyncio.create_task(self._reminder_task(reminder_id))
+                self._sending_tasks.add(task)
+                task.add_done_callback(self._sending_tasks.discard)
+                
+            except asyncio.CancelledError:
+                self.ap.logger.debug("⏹️ 提醒调度协程被取消")
+                raise
+            except Exception as e:
+                self.ap.logger.error(f"❌ 提醒调度出错: {e}")
+
+    async def _reminder_task(self, reminder_id: str):
         """提醒任务"""
         try:
-            await asyncio.sleep(delay)
-            
             # 检查提醒是否仍然存在且活跃
-            if reminder_id in self.reminders and self.reminders[reminder_id].get('active', True):
+            if reminder_id in self.reminders and self.reminders[reminder_id].active:
                 reminder_data = self.reminders[reminder_id]
                 
                 # 发送提醒消息，最多重试3次
                 max_retries = 3
                 for attempt in range(max_retries):
+                    # 重试等待期间提醒可能已被删除或暂停
+                    if not self._is_live(reminder_id, reminder_data):
+                        return
                     try:
                         await self._send_reminder_message(reminder_data)
                         self.ap.logger.info(f"🎯 提醒任务 {reminder_id} 执行成功")
@@ -544,7 +745,8 @@ class ReminderPlugin(BasePlugin):
                             # 可以考虑保存失败的提醒到一个特殊列表中
                 
                 # 处理重复提醒
-                await self._handle_repeat_reminder(reminder_id, reminder_data)
+                if self._is_live(reminder_id, reminder_data):
+                    await self._handle_repeat_reminder(reminder_id, reminder_data)
                     
         except asyncio.CancelledError:
             self.ap.logger.debug(f"⏹️ 提醒任务 {reminder_id} 被取消")
@@ -553,10 +755,14 @@ class ReminderPlugin(BasePlugin):
             import traceback
             self.ap.logger.error(traceback.format_exc())
 
-    async def _send_reminder_message(self, reminder_data: Dict):
+    def _is_live(self, reminder_id: str, reminder_data: Reminder) -> bool:
+        """提醒是否仍然存在且处于活跃状态"""
+        return self.reminders.get(reminder_id) is reminder_data and reminder_data.active
+
+    async def _send_reminder_message(self, reminder_data: Reminder):
         """发送提醒消息（改进版）"""
         try:
-            message_content = f"⏰ 提醒：{reminder_data['content']}"
+            message_content = f"⏰ 提醒：{reminder_data.content}"
             
             # 获取可用的适配器
             adapter = await self._get_available_adapter()
@@ -579,10 +785,10 @@ class ReminderPlugin(BasePlugin):
                     raise Exception("重新获取适配器失败")
             
             # 构建消息链
-            if reminder_data['target_type'] == 'group':
+            if reminder_data.target_type == 'group':
                 # 群聊中@用户
                 message_chain = platform_types.MessageChain([
-                    platform_types.At(reminder_data['sender_id']),
+                    platform_types.At(reminder_data.sender_id),
                     platform_types.Plain(f" {message_content}")
                 ])
             else:
@@ -592,18 +798,18 @@ class ReminderPlugin(BasePlugin):
                 ])
             
             # 记录详细信息用于调试
-            self.ap.logger.debug(f"准备发送消息: target_type={reminder_data['target_type']}, target_id={reminder_data['target_id']}")
+            self.ap.logger.debug(f"准备发送消息: target_type={reminder_data.target_type}, target_id={reminder_data.target_id}")
             
             # 使用 host.send_active_message 方法
             try:
                 await self.host.send_active_message(
                     adapter=adapter,
-                    target_type=reminder_data['target_type'],
-                    target_id=reminder_data['target_id'],
+                    target_type=reminder_data.target_type,
+                    target_id=reminder_data.target_id,
                     message=message_chain
                 )
                 
-                self.ap.logger.info(f"✅ 成功发送提醒给 {reminder_data['sender_id']}: {message_content}")
+                self.ap.logger.info(f"✅ 成功发送提醒给 {reminder_data.sender_id}: {message_content}")
                 
             except Exception as send_error:
                 # 如果是ApiNotAvailable错误，尝试使用备用方法
@@ -624,8 +830,8 @@ class ReminderPlugin(BasePlugin):
                     # 再次尝试发送
                     await self.host.send_active_message(
                         adapter=adapter,
-                        target_type=reminder_data['target_type'],
-                        target_id=reminder_data['target_id'],
+                        target_type=reminder_data.target_type,
+                        target_id=reminder_data.target_id,
                         message=message_chain
                     )
                     
@@ -639,20 +845,18 @@ class ReminderPlugin(BasePlugin):
             self.ap.logger.error(traceback.format_exc())
             raise
 
-    async def _handle_repeat_reminder(self, reminder_id: str, reminder_data: Dict):
+    async def _handle_repeat_reminder(self, reminder_id: str, reminder_data: Reminder):
         """处理重复提醒"""
-        repeat_type = reminder_data.get('repeat_type', '不重复')
+        repeat_type = reminder_data.repeat_type
         
         if repeat_type == '不重复':
             # 删除一次性提醒
             if reminder_id in self.reminders:
-                del self.reminders[reminder_id]
-                await self._save_reminders()
-                if reminder_id in self.running_tasks:
-                    del self.running_tasks[reminder_id]
+                self._remove_reminder(reminder_id)
+                self._mark_dirty()
         else:
             # 计算下次提醒时间
-            current_time = datetime.fromisoformat(reminder_data['target_time'])
+            current_time = self._parsed[reminder_id][0]
             next_time = None
             
             if repeat_type == '每天':
@@ -660,62 +864,63 @@ class ReminderPlugin(BasePlugin):
             elif repeat_type == '每周':
                 next_time = current_time + timedelta(weeks=1)
             elif repeat_type == '每月':
-                # 更准确的月份计算
+                # 按原定日期滚动，下个月没有该日期时（如31日）取当月最后一天
+                if not reminder_data.anchor_day:
+                    reminder_data.anchor_day = current_time.day
                 if current_time.month == 12:
-                    next_time = current_time.replace(year=current_time.year + 1, month=1)
+                    year, month = current_time.year + 1, 1
                 else:
-                    next_time = current_time.replace(month=current_time.month + 1)
+                    year, month = current_time.year, current_time.month + 1
+                day = min(reminder_data.anchor_day, calendar.monthrange(year, month)[1])
+                next_time = current_time.replace(year=year, month=month, day=day)
             
             if next_time:
                 # 更新提醒时间
-                reminder_data['target_time'] = next_time.isoformat()
-                await self._save_reminders()
+                self._update_target_time(reminder_id, next_time)
+                self._mark_dirty()
                 
                 # 安排下次提醒
                 await self._schedule_reminder(reminder_id, reminder_data)
 
     async def _handle_list_reminders(self, ctx: EventContext, sender_id: str):
         """处理查看提醒列表"""
-        user_reminders = [r for r in self.reminders.values() if r['sender_id'] == sender_id and r.get('active', True)]
+        user_reminders = self._get_user_reminders(sender_id)
         
         if not user_reminders:
             ctx.add_return("reply", ["您还没有设置任何提醒。"])
         else:
-            message = "📋 您的提醒列表：\n"
-            for i, reminder in enumerate(user_reminders, 1):
-                time_str = datetime.fromisoformat(reminder['target_time']).strftime("%Y-%m-%d %H:%M")
-                status = "✅ 活跃" if reminder.get('active', True) else "⏸️ 暂停"
-                message += f"{i}. {reminder['content']} - {time_str} ({reminder['repeat_type']}) {status}\n"
+            parts = ["📋 您的提醒列表：\n"]
+            for i, (reminder_id, reminder) in enumerate(user_reminders, 1):
+                time_str = self._parsed[reminder_id][0].strftime("%Y-%m-%d %H:%M")
+                status = "✅ 活跃" if reminder.active else "⏸️ 暂停"
+                parts.append(f"{i}. {reminder.content} - {time_str} ({reminder.repeat_type}) {status}\n")
             
-            ctx.add_return("reply", [message])
+            ctx.add_return("reply", ["".join(parts)])
         
         ctx.prevent_default()
 
-    async def _handle_delete_reminder(self, ctx: EventContext, msg: str, sender_id: str):
+    async def _handle_delete_reminder(self, ctx: EventContext, arg: str, sender_id: str):
         """处理删除提醒"""
         try:
-            parts = msg.split(" ", 1)
-            if len(parts) < 2:
+            if not arg:
                 ctx.add_return("reply", ["请指定要删除的提醒序号，例如：删除提醒 1"])
                 ctx.prevent_default()
                 return
             
-            index = int(parts[1]) - 1
-            user_reminders = [(k, v) for k, v in self.reminders.items() if v['sender_id'] == sender_id]
+            index = int(arg) - 1
+            user_reminders = self._get_user_reminders(sender_id)
             
             if 0 <= index < len(user_reminders):
                 reminder_id, reminder_data = user_reminders[index]
                 
                 # 取消任务
-                if reminder_id in self.running_tasks:
-                    self.running_tasks[reminder_id].cancel()
-                    del self.running_tasks[reminder_id]
+                self._unschedule_reminder(reminder_id)
                 
                 # 删除提醒
-                del self.reminders[reminder_id]
-                await self._save_reminders()
+                self._remove_reminder(reminder_id)
+                self._mark_dirty()
                 
-                ctx.add_return("reply", [f"✅ 已删除提醒：{reminder_data['content']}"])
+                ctx.add_return("reply", [f"✅ 已删除提醒：{reminder_data.content}"])
             else:
                 ctx.add_return("reply", ["提醒序号不存在！"])
                 
@@ -727,48 +932,45 @@ class ReminderPlugin(BasePlugin):
         
         ctx.prevent_default()
 
-    async def _handle_pause_reminder(self, ctx: EventContext, msg: str, sender_id: str):
+    async def _handle_pause_reminder(self, ctx: EventContext, arg: str, sender_id: str):
         """处理暂停提醒"""
-        await self._toggle_reminder(ctx, msg, sender_id, False)
+        await self._toggle_reminder(ctx, arg, sender_id, False)
 
-    async def _handle_resume_reminder(self, ctx: EventContext, msg: str, sender_id: str):
+    async def _handle_resume_reminder(self, ctx: EventContext, arg: str, sender_id: str):
         """处理恢复提醒"""
-        await self._toggle_reminder(ctx, msg, sender_id, True)
+        await self._toggle_reminder(ctx, arg, sender_id, True)
 
-    async def _toggle_reminder(self, ctx: EventContext, msg: str, sender_id: str, active: bool):
+    async def _toggle_reminder(self, ctx: EventContext, arg: str, sender_id: str, active: bool):
         """切换提醒状态"""
         try:
-            parts = msg.split(" ", 1)
-            if len(parts) < 2:
+            if not arg:
                 action = "恢复" if active else "暂停"
                 ctx.add_return("reply", [f"请指定要{action}的提醒序号，例如：{action}提醒 1"])
                 ctx.prevent_default()
                 return
             
-            index = int(parts[1]) - 1
-            user_reminders = [(k, v) for k, v in self.reminders.items() if v['sender_id'] == sender_id]
+            index = int(arg) - 1
+            user_reminders = self._get_user_reminders(sender_id)
             
             if 0 <= index < len(user_reminders):
                 reminder_id, reminder_data = user_reminders[index]
                 
-                if active and not reminder_data.get('active', True):
+                if active and not reminder_data.active:
                     # 恢复提醒
-                    reminder_data['active'] = True
-                    await self._save_reminders()
+                    reminder_data.active = True
+                    self._mark_dirty()
                     await self._schedule_reminder(reminder_id, reminder_data)
-                    ctx.add_return("reply", [f"✅ 已恢复提醒：{reminder_data['content']}"])
+                    ctx.add_return("reply", [f"✅ 已恢复提醒：{reminder_data.content}"])
                     
-                elif not active and reminder_data.get('active', True):
+                elif not active and reminder_data.active:
                     # 暂停提醒
-                    reminder_data['active'] = False
-                    await self._save_reminders()
+                    reminder_data.active = False
+                    self._mark_dirty()
                     
                     # 取消任务
-                    if reminder_id in self.running_tasks:
-                        self.running_tasks[reminder_id].cancel()
-                        del self.running_tasks[reminder_id]
+                    self._unschedule_reminder(reminder_id)
                     
-                    ctx.add_return("reply", [f"⏸️ 已暂停提醒：{reminder_data['content']}"])
+                    ctx.add_return("reply", [f"⏸️ 已暂停提醒：{reminder_data.content}"])
                 else:
                     status = "已经是活跃状态" if active else "已经是暂停状态"
                     ctx.add_return("reply", [f"提醒{status}！"])
@@ -784,35 +986,27 @@ class ReminderPlugin(BasePlugin):
         
         ctx.prevent_default()
 
-    async def _handle_help(self, ctx: EventContext):
+    async def _handle_help(self, ctx: EventContext, sender_id: str):
         """处理帮助命令"""
-        help_text = """📖 定时提醒插件使用说明：
-
-🤖 AI智能设置（推荐）：
-直接对我说话，例如：
-- "提醒我30分钟后开会"
-- "明天下午3点提醒我买菜"
-- "每天晚上8点提醒我吃药"
-
-📋 手动管理命令：
-- 查看提醒 - 查看所有提醒
-- 删除提醒 [序号] - 删除指定提醒
-- 暂停提醒 [序号] - 暂停指定提醒
-- 恢复提醒 [序号] - 恢复指定提醒
-
-⏰ 支持的时间格式：
-- 相对时间：30分钟后、2小时后、明天
-- 绝对时间：今晚8点、明天下午3点
-- 重复类型：每天、每周、每月
+        ctx.add_return("reply", [self._HELP_TEXT])
+        ctx.prevent_default()
 
-💡 使用技巧：
-AI会自动理解你的自然语言，无需记忆复杂命令格式！"""
+    async def shutdown(self):
+        """停止调度和保存协程，取消发送中的任务并写入未保存的修改"""
+        tasks = [task for task in (self._scheduler_task, self._flusher_task) if task]
+        tasks.extend(self._sending_tasks)
         
-        ctx.add_return("reply", [help_text])
-        ctx.prevent_default()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        
+        if self._dirty.is_set():
+            self._dirty.clear()
+            self._save_reminders()
+        
+        self._scheduler_task = None
+        self._flusher_task = None
 
-    def __del__(self):
-        """插件卸载时取消所有任务"""
-        for task in self.running_tasks.values():
-            if not task.done():
-                task.cancel()
\ No newline at end of file
+    async def destroy(self):
+        """插件卸载时触发"""
+        await self.shutdown()